@@ -22,22 +22,94 @@ Examples:
 # Global Constants
 IMAGE_DIR = '/home/aropet/bantubox/images'
 CONTAINER_DIR = '/home/aropet/bantubox/containers'
-
+EXTRACT_CHUNK_SIZE = 1 << 20  # Bytes copied per read/write when extracting image files
+EXTRACT_READ_BUFFER_SIZE = 4 << 20  # Bytes read from the image tarball per read syscall
+NATIVE_TAR_MIN_SIZE = 16 << 20  # Smaller tarballs are extracted in-process, cheaper than starting tar
+EXTRACT_WORKERS = None  # Threads writing file bodies when extracting with tarfile, None for one per usable CPU
+EXTRACT_MAX_PENDING = 64  # File bodies held in memory waiting for a writer thread
+EXTRACT_MAX_BUFFERED_SIZE = 8 << 20  # Larger image files are written as they are read, not held in memory
+EXTRACT_SPARSE_MIN_SIZE = 1 << 20  # Image files this large get holes where their pages are all zeros
+SPARSE_PAGE_SIZE = 4096  # Granularity of the holes left in sparse image files
+CLONE_STACK_SIZE = 1 << 16  # Stack the container setup code runs on before exec
+CONTAINER_OP_WORKERS = 8  # Containers stopped or deleted at once
+DAEMON_SOCKET = '/run/bantubox.sock'  # Unix socket of the `bb.py daemon` container launcher
+DAEMON_MESSAGE_SIZE = 1 << 16  # Largest run request accepted by the daemon
+DEV_TEMPLATE_DIR = '/var/lib/bantubox/dev-template'  # Device nodes bind mounted at each container's /dev
+FICLONE = 0x40049409  # ioctl cloning a whole file on reflink capable filesystems
+# Overlay features tried on every container root: metadata-only copy up, and no syncs to the
+# upper dir, which is thrown away with the container anyway (volatile, Linux 5.10+)
+OVERLAY_FAST_OPTIONS = 'redirect_dir=on,metacopy=on,volatile'
+CONTAINER_PATH = '/usr/local/sbin:/usr/local/bin:/usr/sbin:/usr/bin:/sbin:/bin'  # PATH of container commands
+OVERLAY_OPTIONS_LIMIT = 4000  # Longest overlay option string passed as is; mount(2) data must fit in a page
+# Image tarball suffixes, in order of preference
+IMAGE_SUFFIXES = ('tar.zst', 'tar.xz', 'tar.gz', 'tgz', 'tar.bz2', 'tar')
+# Decompressors of compressed image tarballs by suffix, as candidate commands in order of
+# preference. The parallel implementations come first, as they decompress on several cores.
+DECOMPRESSORS = {
+    '.zst': (('zstd', '-d', '-c', '-q'),),
+    '.xz': (('xz', '-d', '-c', '-q', '-T0'),),
+    '.gz': (('pigz', '-d', '-c'), ('gzip', '-d', '-c')),
+    '.tgz': (('pigz', '-d', '-c'), ('gzip', '-d', '-c')),
+    '.bz2': (('pbzip2', '-d', '-c'), ('bzip2', '-d', '-c')),
+}
+IMAGE_LAYERS_DIR = '_layers'  # Directory under the image dir holding extracted roots by tarball digest
+# Image paths left out of slim image roots: documentation and translations no container needs to run
+SLIM_IMAGE_EXCLUDES = ('usr/share/doc', 'usr/share/man', 'usr/share/info', 'usr/share/locale')
+
+import argparse  # Command line utility
+import concurrent.futures  # Parallel file writes during extraction
+import contextlib
+import errno
+import fcntl  # Reflink cloning ioctl
+import functools
+import hashlib  # Image digests
+import json  # Daemon requests
+import logging
 import os  # File and process management
+import secrets  # Unique container ids
 import shutil
 import signal
+import socket  # Daemon connections
 import stat
-import tarfile  # Extracting the image tarball files
-import uuid  # Unique container ids
+import subprocess  # Native tar extraction
+import sys
+import tempfile
+
+# tarfile and the linux extension are imported by the functions using them,
+# so that commands such as list, stop and delete do not pay for loading them.
+
+# Diagnostics, shown from the level named by the BB_LOG environment variable (WARNING by default)
+logger = logging.getLogger("bantubox")
+
 
-import click  # Command line utility
-import linux  # Linux sys call wrappers
 
+@functools.lru_cache(maxsize=32)
+def _verify_dir(path, description):
+    """
+    Check that a base directory exists, once per process.
+
+    Only successful checks are cached, so a missing directory is checked again
+    on the next call.
+
+    Args:
+        path (str): The directory to check.
+        description (str): What the directory holds, for the error message.
 
+    Raises:
+        FileNotFoundError: If the directory does not exist.
+    """
+    if not os.path.isdir(path):
+        raise FileNotFoundError(f"{description} '{path}' does not exist.")
+
+
+@functools.lru_cache(maxsize=32)
 def _get_image_path(image_name, image_dir, image_suffix='tar'):
     """
     Construct the full file path for a given container image.
 
+    Results are memoized for the life of the process. A process creates at most
+    one container root, so this only spares repeat lookups within a single run.
+
     Args:
         image_name (str): The name of the image.
         image_dir (str): The directory where images are stored.
@@ -51,13 +123,11 @@ def _get_image_path(image_name, image_dir, image_suffix='tar'):
     """
     
     # Check if the directory where images are stored exists
-    if not os.path.exists(image_dir):
-        # If the directory does not exist, raise a FileNotFoundError
-        raise FileNotFoundError(f"Image directory '{image_dir}' does not exist.")
+    _verify_dir(image_dir, 'Image directory')
 
     # Construct and return the full file path of the image
-    # os.path.join is used to ensure the path is correctly formatted for the operating system
-    return os.path.join(image_dir, f"{image_name}.{image_suffix}")
+    # Paths are POSIX only, so the separator is written out instead of going through os.path.join
+    return f"{image_dir}/{image_name}.{image_suffix}"
 
 
 def _get_container_path(container_id, container_dir, *subdir_names):
@@ -77,17 +147,763 @@ def _get_container_path(container_id, container_dir, *subdir_names):
     """
     
     # Verify if the base directory for storing container data exists
-    if not os.path.exists(container_dir):
-        # Raise an exception if the base directory is not found
-        raise FileNotFoundError(f"Container base directory '{container_dir}' does not exist.")
+    _verify_dir(container_dir, 'Container base directory')
 
     # Construct and return the full path to the container's directory
-    # Using os.path.join ensures correct path formatting and concatenation
+    # The components are joined with '/' directly, as the paths are POSIX only
     # The use of *subdir_names allows for a flexible number of subdirectories
-    return os.path.join(container_dir, container_id, *subdir_names)
+    return '/'.join((container_dir, container_id, *subdir_names))
+
 
+def _extract_with_tar(tar_binary, image_file, image_root, excludes=()):
+    """
+    Extract an image tarball with a native tar implementation.
+
+    Args:
+        tar_binary (str): Path to a bsdtar or GNU tar executable.
+        image_file (file): The open image tarball, read by tar as its stdin.
+        image_root (str): Directory the image is extracted into.
+        excludes (tuple): Directories whose contents are not extracted.
+
+    Raises:
+        OSError: If the tar process fails.
+    """
+    # Device nodes are skipped with the rest of /dev, as the container gets its own
+    # /dev at start up. Ownership is restored numerically since the host's user
+    # database does not describe the image.
+    # Excluded directories are kept themselves, only what is inside them is left out.
+    args = [tar_binary, *_tar_exclude_args(tar_binary, ('dev', *excludes)),
+            '-x', '-p', '--numeric-owner', '-f', '-', '-C', image_root]
+    try:
+        subprocess.run(args, stdin=image_file, check=True)
+    except subprocess.CalledProcessError as e:
+        raise OSError(f"Failed to extract {image_file.name} with {tar_binary}: {e}")
+
+
+def _tar_exclude_args(tar_binary, paths):
+    """
+    Build the native tar options leaving out the contents of image directories.
+
+    Exclude patterns match anywhere in a member name by default, which would also
+    drop e.g. usr/lib/python3/dev/. They are anchored at the start of the name,
+    so only the directories at the image root are left out, as in tarfile
+    extraction.
+
+    Args:
+        tar_binary (str): Path to a bsdtar or GNU tar executable.
+        paths (tuple): Directories, relative to the image root, whose contents are left out.
+
+    Returns:
+        list: The tar command line options.
+    """
+    if os.path.basename(tar_binary) == 'bsdtar':
+        # libarchive anchors patterns starting with ^; ?* keeps the directory entry itself
+        args, pattern = [], '^{}/?*'
+    else:
+        # GNU tar anchors every pattern given after --anchored
+        args, pattern = ['--anchored'], '{}/*'
+    for path in paths:
+        # Member names start with or without './' depending on how the image was packed
+        args += ['--exclude', pattern.format(path), '--exclude', pattern.format(f'./{path}')]
+    return args
+
+
+def _extract_image(image_path, image_root, excludes=()):
+    """
+    Extract an image tarball into the image root directory.
+
+    A native tar (bsdtar, which is libarchive's front end, or GNU tar) is used
+    when one is installed, as it parses headers and copies file bodies in C.
+    Otherwise, and for tarballs below NATIVE_TAR_MIN_SIZE, where starting a
+    process costs more than it saves, the tarball is extracted with tarfile.
+
+    The tarball is read once from start to end, so the kernel is told to read
+    ahead aggressively and to drop it from the page cache once extracted.
+    Compressed tarballs are decompressed by a separate process feeding the
+    extractor, picked from DECOMPRESSORS by suffix.
+
+    Args:
+        image_path (str): Path to the image tarball.
+        image_root (str): Directory the image is extracted into.
+        excludes (tuple): Directories whose contents are not extracted.
+
+    Raises:
+        tarfile.TarError: If the tarball cannot be read.
+        OSError: If writing the extracted files fails.
+    """
+    tar_binary = None
+    if os.stat(image_path).st_size >= NATIVE_TAR_MIN_SIZE:
+        tar_binary = shutil.which('bsdtar') or shutil.which('tar')
+
+    # open() wraps the file in an io.BufferedReader of this size
+    with open(image_path, 'rb', buffering=EXTRACT_READ_BUFFER_SIZE) as image_file:
+        fd = image_file.fileno()
+        # Widen readahead on this descriptor and start reading the whole tarball in
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+
+        decompressor = _start_decompressor(image_path, image_file)
+        tar_file = image_file if decompressor is None else decompressor.stdout
+        try:
+            if tar_binary:
+                _extract_with_tar(tar_binary, tar_file, image_root, excludes)
+            else:
+                _extract_with_tarfile(tar_file, image_root, excludes)
+        finally:
+            if decompressor is not None:
+                decompressor.stdout.close()
+                decompressor.wait()
+        if decompressor is not None and decompressor.returncode:
+            raise OSError(f"Failed to decompress {image_path}: {decompressor.args[0]} exited with "
+                          f"status {decompressor.returncode}")
+
+        # The tarball is not read again, so keep its pages from crowding out the containers'
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def _start_decompressor(image_path, image_file):
+    """
+    Start decompressing a compressed image tarball in a separate process.
+
+    Args:
+        image_path (str): Path to the image tarball.
+        image_file (file): The open image tarball, read by the decompressor as its stdin.
+
+    Returns:
+        subprocess.Popen: The decompressor, writing the plain tarball to its stdout
+        pipe, or None if the tarball is not compressed this way.
+
+    Raises:
+        OSError: If none of the decompressors for the tarball is installed.
+    """
+    candidates = DECOMPRESSORS.get(os.path.splitext(image_path)[1])
+    if candidates is None:
+        return None
+
+    for command in candidates:
+        binary = shutil.which(command[0])
+        if binary is not None:
+            break
+    else:
+        names = ' or '.join(command[0] for command in candidates)
+        raise OSError(f"Extracting {image_path} needs the {names} command")
+    # The decompressor runs on cores of its own, while the extractor parses and writes the output
+    return subprocess.Popen([binary, *command[1:]], stdin=image_file, stdout=subprocess.PIPE,
+                            bufsize=EXTRACT_READ_BUFFER_SIZE)
+
+
+def _extract_with_tarfile(image_file, image_root, excludes=()):
+    """
+    Extract an image tarball with the tarfile module.
+
+    The tarball is read as a stream, in a single forward pass over the archive,
+    and in EXTRACT_CHUNK_SIZE chunks so that each file costs a handful of large
+    read/write syscalls instead of one pair per 16 KiB block.
+
+    Args:
+        image_file (file): The open image tarball.
+        image_root (str): Directory the image is extracted into.
+        excludes (tuple): Directories whose contents are not extracted.
 
-def create_container_root(image_name, image_dir, container_id, container_dir):
+    Raises:
+        tarfile.TarError: If the tarball cannot be read.
+        OSError: If writing the extracted files fails.
+    """
+    import tarfile  # Extracting the image tarball files
+
+    # Device nodes are skipped, as the container gets its own /dev at start up, and so
+    # is the rest of /dev, which native tar extraction leaves out as well
+    skip_types = frozenset((tarfile.CHRTYPE, tarfile.BLKTYPE))
+    # Member names start with or without './' depending on how the image was packed
+    excluded_prefixes = tuple(f'{prefix}{path}/' for path in ('dev', *excludes) for prefix in ('', './'))
+
+    # Stream mode ('r|*') never seeks, so members must be handled as they are read, and
+    # gzip, bzip2 and xz compressed tarballs are decompressed on the fly.
+    # bufsize and copybufsize set the chunk sizes for reading the archive and copying file bodies.
+    with tarfile.open(fileobj=image_file, mode='r|*', bufsize=EXTRACT_READ_BUFFER_SIZE,
+                      copybufsize=EXTRACT_CHUNK_SIZE) as tar, \
+            concurrent.futures.ThreadPoolExecutor(max_workers=_extract_workers()) as pool:
+        pending = {}  # Outstanding file body writes, by normalized member name
+        directories = []  # Directories get their attributes once their contents are written
+
+        for member in tar:
+            # Even in stream mode tarfile keeps every member it has read. Only the
+            # directories are needed again, so drop the rest to keep memory flat.
+            tar.members.clear()
+
+            # Filter out character and block device files from the tarball
+            if member.type in skip_types:
+                continue
+            # Skip the contents of excluded directories, keeping the directories themselves
+            if member.name.startswith(excluded_prefixes):
+                continue
+
+            # A member replaces any earlier one of the same name, so that one's write
+            # must have finished before this member is created in its place
+            name = os.path.normpath(member.name)
+            earlier = pending.pop(name, None)
+            if earlier is not None:
+                earlier.result()
+
+            if member.isreg():
+                if member.size > EXTRACT_MAX_BUFFERED_SIZE:
+                    # Too large to hold in memory, so it is copied through in chunks on
+                    # this thread, while the writers finish the files queued before it
+                    _write_member(image_root, member, tar.extractfile(member))
+                    continue
+                # tarfile is not thread-safe, so file bodies are read here in archive order
+                # and only the writes are handed to the worker threads
+                data = tar.extractfile(member).read()
+                if len(pending) >= EXTRACT_MAX_PENDING:
+                    # Bound the memory held by file bodies while the writers catch up
+                    _wait_for_writes(pending, concurrent.futures.FIRST_COMPLETED)
+                pending[name] = pool.submit(_write_member, image_root, member, data)
+                continue
+
+            if member.islnk():
+                # Hard links need their target file to be fully written first
+                _wait_for_writes(pending)
+            if member.isdir():
+                directories.append(member)
+            # Directories, symlinks and hard links are created on this thread, owned
+            # by their numeric ids like regular files and native tar extraction
+            tar.extract(member, image_root, set_attrs=not member.isdir(), numeric_owner=True)
+
+        _wait_for_writes(pending)
+
+        # Restore directory attributes deepest first, as extractall does
+        for member in sorted(directories, key=lambda m: m.name, reverse=True):
+            dir_path = os.path.join(image_root, member.name)
+            tar.chown(member, dir_path, numeric_owner=True)
+            tar.chmod(member, dir_path)
+            tar.utime(member, dir_path)
+
+
+def _extract_workers():
+    """
+    Number of threads writing file bodies during tarfile extraction.
+
+    Returns:
+        int: EXTRACT_WORKERS, or when unset, the CPUs this process may run on.
+    """
+    # The affinity mask, unlike os.cpu_count(), honours cpusets and taskset
+    return EXTRACT_WORKERS or len(os.sched_getaffinity(0))
+
+
+def _write_member(image_root, member, data):
+    """
+    Write the body of a regular tar member and restore its attributes.
+
+    Args:
+        image_root (str): Directory the image is extracted into.
+        member (tarfile.TarInfo): The regular file member being written.
+        data (bytes or file): The member's file contents, or a file to read them from.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    file_path = os.path.join(image_root, member.name)
+    # The parent directory normally precedes the file in the archive, but is not required to
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_NOFOLLOW
+    try:
+        fd = os.open(file_path, flags, 0o600)
+    except FileExistsError:
+        # Left by an earlier member of the same name. It is replaced rather than
+        # opened, so a symlink or hard link there is never written through.
+        os.unlink(file_path)
+        fd = os.open(file_path, flags, 0o600)
+    try:
+        if not isinstance(data, bytes):
+            # Read and written EXTRACT_CHUNK_SIZE at a time, which keeps chunks page aligned
+            offset = 0
+            while True:
+                chunk = data.read(EXTRACT_CHUNK_SIZE)
+                if not chunk:
+                    break
+                _write_sparse(fd, chunk, offset)
+                offset += len(chunk)
+            # Extend the file over a trailing hole, which no write reached
+            os.ftruncate(fd, offset)
+        elif len(data) >= EXTRACT_SPARSE_MIN_SIZE:
+            _write_sparse(fd, data)
+            os.ftruncate(fd, len(data))  # Extend the file over a trailing hole
+        else:
+            # Scanning small files for zero pages costs more than writing them
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        # Ownership first, as chown clears the setuid/setgid bits set by chmod
+        os.fchown(fd, member.uid, member.gid)
+        os.fchmod(fd, member.mode)
+        os.utime(fd, (member.mtime, member.mtime))
+        # Start writeback now and keep image files from crowding the page cache
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+def _write_sparse(fd, data, offset=0):
+    """
+    Write file contents, leaving holes in place of pages that are all zeros.
+
+    A trailing hole is not written, so the caller truncates the file to its size.
+
+    Args:
+        fd (int): Descriptor of the empty file being written.
+        data (bytes): The file contents.
+        offset (int, optional): File offset of the first byte, default 0.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    view = memoryview(data)
+    zero_page = bytes(SPARSE_PAGE_SIZE)
+    run_start = None  # Offset of the run of non-zero pages being collected
+
+    for page in range(0, len(view), SPARSE_PAGE_SIZE):
+        if view[page:page + SPARSE_PAGE_SIZE] == zero_page:
+            if run_start is not None:
+                _pwrite_all(fd, view[run_start:page], offset + run_start)
+                run_start = None
+        elif run_start is None:
+            run_start = page
+
+    if run_start is not None:
+        _pwrite_all(fd, view[run_start:], offset + run_start)
+
+
+def _pwrite_all(fd, view, offset):
+    """
+    Write a buffer at a file offset, retrying short writes.
+
+    Args:
+        fd (int): Descriptor of the file being written.
+        view (memoryview): The bytes to write.
+        offset (int): File offset of the first byte.
+    """
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+
+def _wait_for_writes(pending, return_when=concurrent.futures.FIRST_EXCEPTION):
+    """
+    Wait for outstanding file writes, re-raising the first failure.
+
+    Args:
+        pending (dict): Futures of the submitted writes by member name, left holding
+            those still running.
+        return_when (str): FIRST_EXCEPTION to wait for all writes, or FIRST_COMPLETED
+            to return as soon as one of them is done.
+
+    Raises:
+        OSError: If any of the writes failed.
+    """
+    done, _ = concurrent.futures.wait(pending.values(), return_when=return_when)
+    for name in [name for name, future in pending.items() if future in done]:
+        del pending[name]
+    for future in done:
+        future.result()
+
+
+@functools.lru_cache(maxsize=8)
+def _supports_reflink(directory):
+    """
+    Check whether files in a directory can be cloned with the FICLONE ioctl.
+
+    Args:
+        directory (str): Directory on the filesystem being probed.
+
+    Returns:
+        bool: True if the filesystem supports reflinks (e.g. btrfs, xfs).
+    """
+    src_fd, src_path = tempfile.mkstemp(dir=directory)
+    try:
+        os.write(src_fd, b'bantubox')
+        with tempfile.TemporaryFile(dir=directory) as probe:
+            fcntl.ioctl(probe.fileno(), FICLONE, src_fd)
+        return True
+    except OSError:
+        return False
+    finally:
+        os.close(src_fd)
+        os.unlink(src_path)
+
+
+def _clone_file(src, dst):
+    """
+    Clone a regular file, sharing its data blocks where the filesystem allows it.
+
+    Args:
+        src (str): Path of the file being cloned.
+        dst (str): Path of the new file.
+
+    Raises:
+        OSError: If the file can neither be cloned nor copied.
+    """
+    with open(src, 'rb') as src_file, open(dst, 'wb') as dst_file:
+        try:
+            # Reflink the whole file, this only touches metadata on CoW filesystems
+            fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+            return
+        except OSError as e:
+            # Any other error is a real failure rather than missing reflink support
+            if e.errno not in (errno.EOPNOTSUPP, errno.EXDEV, errno.EINVAL, errno.ENOTTY):
+                raise
+        _copy_in_kernel(src_file.fileno(), dst_file.fileno())
+
+
+def _copy_in_kernel(src_fd, dst_fd):
+    """
+    Copy a file's contents without passing them through user space.
+
+    copy_file_range lets the filesystem copy server side or share extents where
+    it can; sendfile is used where it is not supported for the pair of files.
+
+    Args:
+        src_fd (int): Descriptor of the file being copied, at offset 0.
+        dst_fd (int): Descriptor of the empty destination file.
+
+    Raises:
+        OSError: If the contents cannot be copied.
+    """
+    st = os.fstat(src_fd)
+    size = st.st_size
+
+    # Allocate the destination in one go, unless the source has holes the copy should keep
+    if size and st.st_blocks * 512 >= size:
+        try:
+            os.posix_fallocate(dst_fd, 0, size)
+        except OSError as e:
+            if e.errno != errno.EOPNOTSUPP:
+                raise
+
+    use_sendfile = False
+    copied = 0
+    while copied < size:
+        try:
+            # Both calls advance the descriptors' offsets, so a sendfile fallback resumes where this stopped
+            if use_sendfile:
+                written = os.sendfile(dst_fd, src_fd, None, size - copied)
+            else:
+                written = os.copy_file_range(src_fd, dst_fd, size - copied)
+        except OSError as e:
+            if use_sendfile or e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.EINVAL):
+                raise
+            use_sendfile = True
+            continue
+        if not written:
+            break  # The source shrank while being copied
+        copied += written
+
+
+def _clone_tree(src, dst):
+    """
+    Clone a directory tree, preserving symlinks, hard links, special files,
+    ownership, modes and times.
+
+    Args:
+        src (str): Root of the tree being cloned.
+        dst (str): Directory the tree is cloned into.
+
+    Raises:
+        OSError: If any entry cannot be cloned.
+    """
+    directories = []  # Directory attributes are restored once their contents exist
+    links = {}  # Clones of files with several links, by the source's (st_dev, st_ino)
+    for dirpath, dirnames, filenames in os.walk(src):
+        target_dir = os.path.normpath(os.path.join(dst, os.path.relpath(dirpath, src)))
+        os.makedirs(target_dir, exist_ok=True)
+        directories.append((dirpath, target_dir))
+
+        for name in dirnames:
+            src_path = os.path.join(dirpath, name)
+            # os.walk lists symlinks to directories in dirnames without following them.
+            # Real directories are created when os.walk descends into them.
+            if os.path.islink(src_path):
+                _clone_entry(src_path, os.path.join(target_dir, name), links)
+        for name in filenames:
+            _clone_entry(os.path.join(dirpath, name), os.path.join(target_dir, name), links)
+
+    for src_path, dst_path in reversed(directories):
+        _copy_attributes(src_path, dst_path)
+
+
+def _clone_entry(src_path, dst_path, links):
+    """
+    Clone a single entry of a tree other than a directory, according to its file type.
+
+    Args:
+        src_path (str): Path of the entry being cloned.
+        dst_path (str): Path of the new entry.
+        links (dict): Paths of the clones of files with several links, by the
+            source's (st_dev, st_ino), shared by all entries of the tree.
+
+    Raises:
+        OSError: If the entry cannot be cloned.
+    """
+    st = os.lstat(src_path)
+    if stat.S_ISREG(st.st_mode):
+        if st.st_nlink > 1:
+            key = (st.st_dev, st.st_ino)
+            if key in links:
+                # Another name of a file already cloned, with its attributes, so link it
+                os.link(links[key], dst_path)
+                return
+            links[key] = dst_path
+        _clone_file(src_path, dst_path)
+    elif stat.S_ISLNK(st.st_mode):
+        os.symlink(os.readlink(src_path), dst_path)
+    else:
+        # FIFOs, sockets and device nodes are made anew, as opening a FIFO
+        # would block until a writer shows up
+        os.mknod(dst_path, st.st_mode, st.st_rdev)
+    _copy_attributes(src_path, dst_path)
+
+
+def _copy_attributes(src, dst):
+    """
+    Copy ownership, mode, times and extended attributes without following symlinks.
+
+    Args:
+        src (str): Path the attributes are read from.
+        dst (str): Path the attributes are applied to.
+    """
+    st = os.lstat(src)
+    # Ownership first, as chown clears the setuid/setgid bits
+    os.lchown(dst, st.st_uid, st.st_gid)
+    shutil.copystat(src, dst, follow_symlinks=False)
+
+
+def _clone_or_extract(image_path, image_root, excludes=()):
+    """
+    Populate the image root, cloning it from an extracted template when possible.
+
+    On filesystems with reflink support the tarball is extracted only once, into
+    a `<image_root>.template` directory, and every image root is then cloned
+    from it in O(inode count) rather than O(image size). Elsewhere a template
+    would only double the disk usage, so the tarball is extracted directly.
+
+    Args:
+        image_path (str): Path to the image tarball.
+        image_root (str): Directory the image is populated into.
+        excludes (tuple): Directories whose contents are not extracted.
+
+    Raises:
+        OSError: If extraction or cloning fails.
+    """
+    template = image_root + '.template'
+
+    if not os.path.exists(template):
+        if not _supports_reflink(os.path.dirname(image_root)):
+            _publish_dir(image_root, lambda path: _extract_image(image_path, path, excludes))
+            return
+        _publish_dir(template, lambda path: _extract_image(image_path, path, excludes))
+
+    _publish_dir(image_root, lambda path: _clone_tree(template, path))
+
+
+def _publish_dir(path, populate):
+    """
+    Populate a directory under a temporary name and rename it into place.
+
+    The rename is atomic, so `path` either does not exist or is complete, even
+    if populating it is interrupted.
+
+    Args:
+        path (str): Directory to create.
+        populate (Callable): Called with the temporary directory to fill in.
+
+    Raises:
+        OSError: If populating or publishing the directory fails.
+    """
+    tmp_path = tempfile.mkdtemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + '.tmp.')
+    try:
+        os.chmod(tmp_path, 0o755)  # mkdtemp creates the directory private to its owner
+        populate(tmp_path)
+        os.rename(tmp_path, path)
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        # Another run may have published the same directory first
+        if not os.path.isdir(path):
+            raise
+
+
+def _image_digest(image_path):
+    """
+    Compute the SHA-256 digest of an image tarball.
+
+    The digest is kept in a `<image_path>.sha256` file next to the tarball, and
+    only recomputed once the tarball's inode, size, modification time or change
+    time differs. The change time cannot be set by hand, so a tarball replaced
+    with a copy keeping the size and mtime (cp -p, rsync -t) is hashed again.
+
+    Args:
+        image_path (str): Path to the image tarball.
+
+    Returns:
+        str: The hex digest of the tarball.
+
+    Raises:
+        OSError: If the tarball cannot be read.
+    """
+    digest_path = image_path + '.sha256'
+
+    with open(image_path, 'rb') as image_file:
+        st = os.fstat(image_file.fileno())
+        key = f'{st.st_ino} {st.st_size} {st.st_mtime_ns} {st.st_ctime_ns}'
+        try:
+            with open(digest_path) as digest_file:
+                cached_key, _, digest = digest_file.read().strip().rpartition(' ')
+            if cached_key == key:
+                return digest
+        except FileNotFoundError:
+            pass  # Not hashed yet
+
+        os.posix_fadvise(image_file.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        if hasattr(hashlib, 'file_digest'):
+            # Python 3.11+ hashes straight from the file into OpenSSL, without the GIL
+            digest = hashlib.file_digest(image_file, 'sha256').hexdigest()
+        else:
+            sha256 = hashlib.sha256()
+            buffer = memoryview(bytearray(EXTRACT_CHUNK_SIZE))
+            while size := image_file.readinto(buffer):
+                sha256.update(buffer[:size])
+            digest = sha256.hexdigest()
+
+    # Written under a temporary name, so a partial digest file is never read
+    tmp_path = f'{digest_path}.tmp.{os.getpid()}'
+    try:
+        with open(tmp_path, 'w') as digest_file:
+            digest_file.write(f'{key} {digest}\n')
+        os.rename(tmp_path, digest_path)
+    except OSError:
+        # The digest is still correct, it will just be computed again next time
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+    return digest
+
+
+@functools.lru_cache(maxsize=64)
+def _overlay_options(image_root):
+    """
+    Build the overlay mount options template of an image root.
+
+    The cache lasts for the container process only, where it spares rebuilding
+    the template when long paths fall back to relative upper and work dirs.
+
+    Args:
+        image_root (str): The image root used as the overlay's lower directory.
+
+    Returns:
+        str: The mount options, with %s placeholders for the upper and work directories.
+    """
+    return f"lowerdir={image_root.replace('%', '%%')},upperdir=%s,workdir=%s"
+
+
+def _mount_overlay(target, lower_dir, upper_dir, work_dir):
+    """
+    Mount an overlay filesystem with the fsopen API.
+
+    Each option is passed to the kernel on its own, so there is no option
+    string to build and parse, and options the kernel does not support are
+    simply left out. On Linux 6.8+ the lower directory is passed as an open
+    descriptor instead of a path string.
+
+    Args:
+        target (str): Mount point.
+        lower_dir (str): The image root, mounted read-only under the overlay.
+        upper_dir (str): Directory receiving the container's changes.
+        work_dir (str): Overlay work directory, on the same filesystem as upper_dir.
+
+    Returns:
+        bool: True if mounted, False when the kernel lacks the fsopen API or
+        rejects this configuration, and mount(2) must be used instead.
+    """
+    import linux  # Linux sys call wrappers
+
+    try:
+        fs_fd = linux.fsopen('overlay', linux.FSOPEN_CLOEXEC)
+    except RuntimeError:
+        return False
+
+    try:
+        try:
+            linux.fsconfig(fs_fd, linux.FSCONFIG_SET_FD, 'lowerdir+', None, _open_dir(lower_dir))
+        except RuntimeError:
+            linux.fsconfig(fs_fd, linux.FSCONFIG_SET_STRING, 'lowerdir', lower_dir, 0)
+        linux.fsconfig(fs_fd, linux.FSCONFIG_SET_STRING, 'upperdir', upper_dir, 0)
+        linux.fsconfig(fs_fd, linux.FSCONFIG_SET_STRING, 'workdir', work_dir, 0)
+
+        # The OVERLAY_FAST_OPTIONS, each one only where this kernel supports it
+        for option in OVERLAY_FAST_OPTIONS.split(','):
+            key, _, value = option.partition('=')
+            try:
+                if value:
+                    linux.fsconfig(fs_fd, linux.FSCONFIG_SET_STRING, key, value, 0)
+                else:
+                    linux.fsconfig(fs_fd, linux.FSCONFIG_SET_FLAG, key, None, 0)
+            except RuntimeError as e:
+                if e.args[0] != errno.EINVAL:
+                    raise
+
+        linux.fsconfig(fs_fd, linux.FSCONFIG_CMD_CREATE, None, None, 0)
+        mount_fd = linux.fsmount(fs_fd, linux.FSMOUNT_CLOEXEC, linux.MOUNT_ATTR_NODEV)
+    except RuntimeError:
+        # e.g. a path longer than the 255 bytes fsconfig accepts, or metacopy refused when
+        # creating the superblock; mount(2) retries without them and reports real errors
+        return False
+    finally:
+        os.close(fs_fd)
+
+    _attach_mount(mount_fd, 'overlay', target)
+    return True
+
+
+@functools.lru_cache(maxsize=64)
+def _open_dir(path):
+    """
+    Open a directory for passing to the kernel by descriptor.
+
+    The descriptor is cached for the rest of the container process, where the
+    overlay is mounted, and closed with the others before the command is exec'd.
+
+    Args:
+        path (str): The directory to open.
+
+    Returns:
+        int: A read-only descriptor for the directory, left open.
+
+    Raises:
+        OSError: If the directory cannot be opened.
+    """
+    # fsconfig takes no O_PATH descriptors, so the directory is opened for reading
+    return os.open(path, os.O_RDONLY | os.O_DIRECTORY | os.O_CLOEXEC)
+
+
+def _remove_stale_tmp_dirs(layer_dir):
+    """
+    Remove directories left half populated by a run killed while publishing them.
+
+    Must be called with the layer directory locked, as only then is no
+    temporary directory in it still being populated.
+
+    Args:
+        layer_dir (str): Directory holding an image digest's roots.
+    """
+    with os.scandir(layer_dir) as entries:
+        for entry in entries:
+            # Named by _publish_dir as <name>.tmp.<random>
+            if '.tmp.' in entry.name and entry.is_dir(follow_symlinks=False):
+                logger.info("Removing stale %s", entry.path)
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def create_container_root(image_name, image_dir, container_id, container_dir, slim_image=False,
+                          reflink_root=False):
     """
     Create a root directory for a container and set up its filesystem.
 
@@ -96,6 +912,10 @@ def create_container_root(image_name, image_dir, container_id, container_dir):
         image_dir (str): Directory where container images are stored.
         container_id (str): Unique identifier for the container.
         container_dir (str): Directory for storing container-related files.
+        slim_image (bool): Use an image root without the SLIM_IMAGE_EXCLUDES contents.
+        reflink_root (bool): Give the container a reflinked copy of the image root instead of
+            an overlay, where the image and container directories share a filesystem with
+            reflink support.
 
     Returns:
         str: Path to the container's root filesystem.
@@ -104,105 +924,262 @@ def create_container_root(image_name, image_dir, container_id, container_dir):
         FileNotFoundError: If the image file does not exist.
         OSError: If directory creation or file extraction fails.
     """
-    # Retrieve the full path to the specified container image
-    image_path = _get_image_path(image_name, image_dir)
-    # Create a path for the root filesystem of the image
-    image_root = os.path.join(image_dir, image_name, 'rootfs')
-
-    # Check if the image file exists at the specified path
-    if not os.path.exists(image_path):
+    import linux  # Linux sys call wrappers
+
+    # Retrieve the full path to the specified container image, compressed or not
+    for image_suffix in IMAGE_SUFFIXES:
+        image_path = _get_image_path(image_name, image_dir, image_suffix)
+        # Check if the image file exists at the specified path
+        if os.path.exists(image_path):
+            break
+    else:
         # Raise an error if the image file is not found
         raise FileNotFoundError(f"Unable to locate image {image_name}")
 
-    # If the image root directory doesn't exist, create it and extract the image
-    if not os.path.exists(image_root):
-        os.makedirs(image_root)  # Create the root filesystem directory
-        # Open the tarball image file
-        with tarfile.open(image_path) as tar:
-            # Filter out character and block device files from the tarball
-            members = [m for m in tar.getmembers() if m.type not in (tarfile.CHRTYPE, tarfile.BLKTYPE)]
-            # Extract the filtered files into the root filesystem directory
-            tar.extractall(image_root, members=members)
+    # Image roots are keyed by the tarball's contents, so every image name and copy of
+    # the same tarball shares one extracted tree, and with it one set of cached pages.
+    # Slim roots are kept apart, so full and slim containers of one image can coexist.
+    image_root = os.path.join(image_dir, IMAGE_LAYERS_DIR, _image_digest(image_path),
+                              'rootfs-slim' if slim_image else 'rootfs')
+    excludes = SLIM_IMAGE_EXCLUDES if slim_image else ()
+
+    # If the image root directory doesn't exist, extract the image
+    if not os.path.isdir(image_root):
+        layer_dir = os.path.dirname(image_root)
+        os.makedirs(layer_dir, exist_ok=True)
+        # The lock is on the digest's directory, shared by every image name with this content
+        layer_lock = os.open(layer_dir, os.O_RDONLY | os.O_DIRECTORY | os.O_CLOEXEC)
+        try:
+            # Concurrent runs of the same image wait here and reuse the first extraction
+            fcntl.flock(layer_lock, fcntl.LOCK_EX)
+            if not os.path.exists(image_root):
+                _remove_stale_tmp_dirs(layer_dir)
+                logger.info("Populating image root %s from %s", image_root, image_path)
+                _clone_or_extract(image_path, image_root, excludes)
+        finally:
+            os.close(layer_lock)
+
+    # The container's directory is joined once, and its subdirectories appended to it
+    container_path = _get_container_path(container_id, container_dir)
+    container_rootfs = container_path + '/rootfs'  # Mount point for the overlay
+
+    if (reflink_root and os.stat(image_root).st_dev == os.stat(container_dir).st_dev
+            and _supports_reflink(container_dir)):
+        # The container's files share their blocks with the image root until written, like
+        # an overlay, but are read and written without overlay lookups and copy ups
+        return _clone_root(image_root, container_rootfs)
 
     # Create directories for the overlay filesystem components
-    container_cow_rw = _get_container_path(container_id, container_dir, 'cow_rw')  # Copy-on-write directory
-    container_cow_workdir = _get_container_path(container_id, container_dir, 'cow_workdir')  # Overlay work directory
-    container_rootfs = _get_container_path(container_id, container_dir, 'rootfs')  # Mount point for the overlay
-
-    # Ensure these directories exist, creating them if necessary
-    for directory in [container_cow_rw, container_cow_workdir, container_rootfs]:
-        os.makedirs(directory, exist_ok=True)
+    container_cow_rw = container_path + '/cow_rw'  # Copy-on-write directory
+    container_cow_workdir = container_path + '/cow_workdir'  # Overlay work directory
+
+    # Ensure these directories exist, creating them if necessary. os.makedirs stats each
+    # parent first, so it only creates the container's directory, and a plain mkdir each
+    # of its subdirectories.
+    os.makedirs(container_path, exist_ok=True)
+    for directory in (container_cow_rw, container_cow_workdir, container_rootfs):
+        try:
+            os.mkdir(directory)
+        except FileExistsError:
+            pass  # Left over from an earlier attempt with this container id
 
-    # Prepare the mount options for the overlay filesystem
-    mount_options = f"lowerdir={image_root},upperdir={container_cow_rw},workdir={container_cow_workdir}"
     # Mount the overlay filesystem at the container's root filesystem path
-    linux.mount('overlay', container_rootfs, 'overlay', linux.MS_NODEV, mount_options)
+    if not _mount_overlay(container_rootfs, image_root, container_cow_rw, container_cow_workdir):
+        # Prepare the mount options for the overlay filesystem
+        mount_options = _overlay_options(image_root) % (container_cow_rw, container_cow_workdir)
+        if len(mount_options) + len(OVERLAY_FAST_OPTIONS) >= OVERLAY_OPTIONS_LIMIT:
+            # Long container paths would be truncated by the kernel, so name the upper and
+            # work directories relative to the container directory, which overlay resolves
+            # against the working directory. The container chdirs into its root right after.
+            os.chdir(container_path)
+            mount_options = _overlay_options(image_root) % ('cow_rw', 'cow_workdir')
+        try:
+            linux.mount('overlay', container_rootfs, 'overlay', linux.MS_NODEV,
+                        f"{mount_options},{OVERLAY_FAST_OPTIONS}")
+        except RuntimeError as e:
+            # Older kernels, or one built without metacopy, reject the unknown options.
+            # metacopy also needs real root, and is refused inside a user namespace.
+            if e.args[0] not in (errno.EINVAL, errno.EPERM):
+                raise
+            try:
+                linux.mount('overlay', container_rootfs, 'overlay', linux.MS_NODEV, mount_options)
+            except RuntimeError as e:
+                # Without overlay support, give the container its own copy of the image root.
+                # On a reflink capable filesystem the copy shares the image root's blocks.
+                if e.args[0] != errno.ENODEV:
+                    raise
+                logger.warning("Overlay is unavailable, cloning %s for the container", image_root)
+                return _clone_root(image_root, container_rootfs)
 
     # Return the path to the mounted root filesystem of the container
     return container_rootfs
 
 
-@click.group()
-def cli():
+def _clone_root(image_root, container_rootfs):
     """
-    Command-line interface for managing containers with BantuBox.
+    Clone an image root into a container's root filesystem and make it a mount point.
 
-    This CLI provides commands for running, stopping, listing, and deleting containers.
-    
-    The `@click.group()` decorator transforms this function into a Click group, 
-    which acts as the entry point for a set of subcommands. This is akin to creating 
-    a command with multiple actions, like `git push`, `git pull`, etc., where `git` 
-    would be the group and `push`, `pull` are its subcommands.
+    Args:
+        image_root (str): The extracted image root to clone.
+        container_rootfs (str): The container's root filesystem path.
+
+    Returns:
+        str: The container's root filesystem path.
     """
-    # The 'pass' statement is used here because this function is not meant to 
-    # execute any code itself. Instead, it serves as a holder for the group of 
-    # commands that will be attached to it. These commands are defined as separate 
-    # functions and are linked to this group through decorators.
-    pass
+    import linux  # Linux sys call wrappers
+
+    _clone_tree(image_root, container_rootfs)
+    # Bind the copy onto itself, as pivot_root needs the new root to be a mount point
+    linux.mount(container_rootfs, container_rootfs, None, linux.MS_BIND, None)
+    linux.mount(None, container_rootfs, None, linux.MS_REMOUNT | linux.MS_BIND | linux.MS_NODEV, None)
+    return container_rootfs
+
+
+# Device nodes created in /dev, as (name, mode, device number).
+# These devices include /dev/null, /dev/zero, etc., which are commonly required in a Linux environment.
+_DEVICES = tuple(
+    (name, 0o666 | dev_type, os.makedev(major, minor))
+    for name, (dev_type, major, minor) in {
+        'null': (stat.S_IFCHR, 1, 3),  # Character device, Major number 1, Minor number 3
+        'zero': (stat.S_IFCHR, 1, 5),
+        'random': (stat.S_IFCHR, 1, 8),
+        'urandom': (stat.S_IFCHR, 1, 9),
+        'console': (stat.S_IFCHR, 136, 1),
+        'tty': (stat.S_IFCHR, 5, 0),
+        'full': (stat.S_IFCHR, 1, 7),
+    }.items()
+)
+
+# Symlinks created in /dev for the file descriptor directory and the standard file
+# descriptors, as (name, target).
+_STDIO_LINKS = (('fd', '/proc/self/fd'),) + tuple(
+    (name, f'/proc/self/fd/{fd}') for fd, name in enumerate(('stdin', 'stdout', 'stderr')))
+# Bumped when makedev changes how it creates entries, so existing templates are redone
+_DEV_TEMPLATE_REVISION = 2
+# Names the /dev template's sentinel after its contents, so changing them rebuilds existing templates
+_DEV_TEMPLATE_VERSION = hashlib.sha256(
+    repr((_DEV_TEMPLATE_REVISION, _DEVICES, _STDIO_LINKS)).encode()).hexdigest()[:12]
 
 
 def makedev(dev_path):
     """
-    Create device identifiers and special files in the container's /dev directory.
+    Create device identifiers and special files in a /dev directory.
 
     Args:
-    - dev_path (str): The path to the container's /dev directory.
+    - dev_path (str): The path to the /dev directory, normally the device template.
 
     Raises:
     - OSError: If symlink or device creation fails.
     """
 
-    # Standard file descriptors (stdin, stdout, stderr) are created as symlinks
-    # to corresponding file descriptors of the host process.
-    std_fds = ['stdin', 'stdout', 'stderr']
-    for i, dev in enumerate(std_fds):
-        fd_path = os.path.join('/proc/self/fd', str(i))  # Path to the host's file descriptor
-        dev_symlink = os.path.join(dev_path, dev)  # Path for the symlink in the container's /dev directory
-        try:
-            if not os.path.exists(dev_symlink):  # Check if symlink already exists
-                os.symlink(fd_path, dev_symlink)  # Create a symlink to the host's file descriptor
-        except OSError as e:
-            raise OSError(f"Failed to create symlink for {dev}: {e}")  # Raise error if symlink creation fails
+    # Every entry is created relative to a descriptor for dev_path,
+    # so the kernel resolves dev_path once instead of once per entry
+    dev_fd = os.open(dev_path, os.O_PATH | os.O_DIRECTORY)
+    try:
+        # Standard file descriptors (stdin, stdout, stderr) are created as symlinks
+        # to corresponding file descriptors of the host process.
+        for dev, fd_path in _STDIO_LINKS:
+            try:
+                os.symlink(fd_path, dev, dir_fd=dev_fd)  # Create a symlink to the host's file descriptor
+            except FileExistsError:
+                pass  # Symlink already exists; the failed syscall was the existence check
+            except OSError as e:
+                raise OSError(f"Failed to create symlink for {dev}: {e}")  # Raise error if symlink creation fails
+
+        # Creating additional device nodes from the precomputed device table.
+        for device, mode, device_number in _DEVICES:
+            try:
+                os.mknod(device, mode, device_number, dir_fd=dev_fd)  # Create the device node
+            except FileExistsError:
+                pass  # Device node already exists
+            except OSError as e:
+                raise OSError(f"Failed to create device {device}: {e}")  # Raise error if device node creation fails
+            # mknod applies the umask, and containers only get the template read-only,
+            # so set the permissions explicitly, also repairing existing nodes
+            os.chmod(device, mode & 0o7777, dir_fd=dev_fd)
+    finally:
+        os.close(dev_fd)
+
+
+def _ensure_dev_template():
+    """
+    Populate the host-side /dev template that is bind mounted into containers.
 
-    # Creating additional device nodes.
-    # These devices include /dev/null, /dev/zero, etc., which are commonly required in a Linux environment.
-    DEVICES = {
-        'null': (stat.S_IFCHR, 1, 3),  # Character device, Major number 1, Minor number 3
-        'zero': (stat.S_IFCHR, 1, 5),
-        'random': (stat.S_IFCHR, 1, 8),
-        'urandom': (stat.S_IFCHR, 1, 9),
-        'console': (stat.S_IFCHR, 136, 1),
-        'tty': (stat.S_IFCHR, 5, 0),
-        'full': (stat.S_IFCHR, 1, 7)
-    }
+    The template is built by the first container start and reused afterwards;
+    a sentinel file next to it, named after _DEV_TEMPLATE_VERSION, marks it as
+    complete. When the device tables change, the existing template is filled
+    in with the missing entries. The fd, stdin, stdout and stderr symlinks
+    point at /proc/self/fd, so they resolve to the file descriptors of
+    whichever process follows them and can be shared as well.
 
-    for device, (dev_type, major, minor) in DEVICES.items():
-        device_path = os.path.join(dev_path, device)  # Path for the device node in the container's /dev directory
-        try:
-            if not os.path.exists(device_path):  # Check if device node already exists
-                os.mknod(device_path, 0o666 | dev_type, os.makedev(major, minor))  # Create the device node
-        except OSError as e:
-            raise OSError(f"Failed to create device {device}: {e}")  # Raise error if device node creation fails
+    Raises:
+    - OSError: If the template directory or its devices cannot be created.
+    """
+    sentinel = f'{DEV_TEMPLATE_DIR}.ready-{_DEV_TEMPLATE_VERSION}'
+    if os.path.exists(sentinel):
+        return
+
+    os.makedirs(os.path.join(DEV_TEMPLATE_DIR, 'pts'), exist_ok=True)  # devpts mount point
+    os.chmod(DEV_TEMPLATE_DIR, 0o755)
+    makedev(DEV_TEMPLATE_DIR)
+
+    # Only mark the template ready once every device exists
+    with open(sentinel, 'w'):
+        pass
+
+
+def _prepare_mount(fstype):
+    """
+    Create a detached mount of a pseudo filesystem with the fsopen API.
+
+    Args:
+    - fstype (str): Filesystem type, e.g. 'proc'.
+
+    Returns:
+    - int: Descriptor of the detached mount, or None when the kernel predates
+      the fsopen API (Linux 5.2) and the filesystem must be mounted with mount(2).
+
+    Raises:
+    - RuntimeError: If the filesystem cannot be created.
+    """
+    import linux  # Linux sys call wrappers
+
+    try:
+        fs_fd = linux.fsopen(fstype, linux.FSOPEN_CLOEXEC)
+    except RuntimeError as e:
+        if e.args[0] == errno.ENOSYS:
+            return None
+        raise
+
+    try:
+        linux.fsconfig(fs_fd, linux.FSCONFIG_CMD_CREATE, None, None, 0)
+        return linux.fsmount(fs_fd, linux.FSMOUNT_CLOEXEC, 0)
+    finally:
+        os.close(fs_fd)
+
+
+def _attach_mount(mount_fd, fstype, target):
+    """
+    Attach a mount prepared by _prepare_mount at its mount point.
+
+    Args:
+    - mount_fd (int): Descriptor of the detached mount, or None to mount with mount(2).
+    - fstype (str): Filesystem type, used for the mount(2) fallback.
+    - target (str): Mount point.
+
+    Raises:
+    - RuntimeError: If the mount cannot be attached.
+    """
+    import linux  # Linux sys call wrappers
+
+    if mount_fd is None:
+        linux.mount(fstype, target, fstype, 0, '')
+        return
+
+    try:
+        linux.move_mount(mount_fd, '', linux.AT_FDCWD, target, linux.MOVE_MOUNT_F_EMPTY_PATH)
+    finally:
+        os.close(mount_fd)
 
 
 def _create_mounts(new_root):
@@ -215,37 +1192,68 @@ def _create_mounts(new_root):
     Raises:
     - OSError: If an error occurs during the mount operations.
     """
+    import linux  # Linux sys call wrappers
+
     try:
+        # Prepare the pseudo filesystems as detached mounts before attaching any of them,
+        # so a failure leaves nothing half mounted in the new root.
+        proc_mount = _prepare_mount('proc')
+        sysfs_mount = _prepare_mount('sysfs')
+        devpts_mount = _prepare_mount('devpts')
+
+        # Every mount point is under new_root, whose path is already normalized
+        base = new_root + '/'
+
         # Mount the 'proc' filesystem at /proc.
         # This is essential for processes within the container to access process information.
-        proc_path = os.path.join(new_root, 'proc')
-        linux.mount('proc', proc_path, 'proc', 0, '')
+        proc_path = base + 'proc'
+        _attach_mount(proc_mount, 'proc', proc_path)
 
         # Mount the 'sysfs' filesystem at /sys.
         # This provides information about kernel and connected devices.
-        sysfs_path = os.path.join(new_root, 'sys')
-        linux.mount('sysfs', sysfs_path, 'sysfs', 0, '')
+        sysfs_path = base + 'sys'
+        _attach_mount(sysfs_mount, 'sysfs', sysfs_path)
 
-        # Mount a 'tmpfs' filesystem at /dev.
-        # This is a temporary file storage used for creating device files.
-        dev_path = os.path.join(new_root, 'dev')
-        linux.mount('tmpfs', dev_path, 'tmpfs', linux.MS_NOSUID | linux.MS_STRICTATIME, 'mode=755')
+        # Bind mount the prebuilt device template at /dev.
+        # One mount replaces creating every device node and symlink per container,
+        # and the read-only remount keeps containers from altering the shared template.
+        _ensure_dev_template()
+        dev_path = base + 'dev'
+        linux.mount(DEV_TEMPLATE_DIR, dev_path, None, linux.MS_BIND, None)
+        linux.mount(None, dev_path, None, linux.MS_REMOUNT | linux.MS_BIND | linux.MS_RDONLY | linux.MS_NOSUID, None)
 
         # Mount the 'devpts' filesystem to enable pseudo-terminal devices (PTYs).
         # Necessary for terminal emulation within the container.
-        devpts_path = os.path.join(dev_path, 'pts')
-        if not os.path.exists(devpts_path):
-            os.makedirs(devpts_path)  # Create the directory if it doesn't exist.
-        linux.mount('devpts', devpts_path, 'devpts', 0, '')
-
-        # Call makedev function to create essential device nodes in /dev.
-        makedev(dev_path)
+        # The mount point is part of the template, since /dev is read-only by now.
+        devpts_path = dev_path + '/pts'
+        _attach_mount(devpts_mount, 'devpts', devpts_path)
 
     except OSError as e:
         raise OSError(f"Failed to create mounts: {e}")  # Handle exceptions during mount operations.
 
 
 
+def _write_small(path, value):
+    """
+    Write a short value to a cgroup control file or a container state file.
+
+    Such files take a single write(2) of the value, so the file is written
+    through a raw descriptor rather than Python's buffered text IO stack.
+
+    Args:
+    - path (str): Path to the file, created if it does not exist.
+    - value (int or bytes): Value to write.
+
+    Raises:
+    - OSError: If the file cannot be opened or written.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o644)
+    try:
+        os.write(fd, value if isinstance(value, bytes) else b'%d' % value)
+    finally:
+        os.close(fd)
+
+
 def _setup_cpu_cgroup(container_id, cpu_shares):
     """
     Setup a CPU cgroup for the container.
@@ -263,16 +1271,14 @@ def _setup_cpu_cgroup(container_id, cpu_shares):
     # Construct the path for the container's specific CPU cgroup directory
     container_cpu_cgroup_dir = os.path.join(CPU_CGROUP_BASEDIR, 'bantubox', container_id)
 
-    # Check if the container's CPU cgroup directory exists, create it if not
-    if not os.path.exists(container_cpu_cgroup_dir):
-        os.makedirs(container_cpu_cgroup_dir)
+    # Create the container's CPU cgroup directory, an existing one is reused
+    os.makedirs(container_cpu_cgroup_dir, exist_ok=True)
 
     # Path for the 'tasks' file within the CPU cgroup directory
     tasks_file = os.path.join(container_cpu_cgroup_dir, 'tasks')
     try:
-        # Open the 'tasks' file and write the current process ID (PID)
-        with open(tasks_file, 'w') as file:
-            file.write(str(os.getpid()))
+        # Write the current process ID (PID) to the 'tasks' file
+        _write_small(tasks_file, os.getpid())
     except OSError as e:
         # Handle any exceptions related to file operations
         raise OSError(f"Failed to write to tasks file: {e}")
@@ -282,15 +1288,66 @@ def _setup_cpu_cgroup(container_id, cpu_shares):
         # Path for the 'cpu.shares' file within the CPU cgroup directory
         cpu_shares_file = os.path.join(container_cpu_cgroup_dir, 'cpu.shares')
         try:
-            # Open the 'cpu.shares' file and write the specified CPU shares
-            with open(cpu_shares_file, 'w') as file:
-                file.write(str(cpu_shares))
+            # Write the specified CPU shares to the 'cpu.shares' file
+            _write_small(cpu_shares_file, cpu_shares)
         except OSError as e:
             # Handle any exceptions related to file operations
             raise OSError(f"Failed to set cpu shares: {e}")
 
 
-def contain(command, image_name, image_dir, container_id, container_dir, cpu_shares, memory, memory_swap):
+def _change_root(new_root, fast_root=False):
+    """
+    Switch the calling process to the container's root filesystem.
+
+    By default the root is swapped with pivot_root and the old root is detached,
+    so nothing of the host filesystem stays reachable. With `fast_root` the new
+    root is instead moved over / and entered with chroot, which takes fewer
+    syscalls but leaves the old root hidden under the moved mount rather than
+    detached.
+
+    Args:
+    - new_root (str): Path to the container's new root filesystem.
+    - fast_root (bool): Use MS_MOVE and chroot instead of pivot_root.
+
+    Raises:
+    - OSError: If the root filesystem cannot be changed.
+    """
+    import linux  # Linux sys call wrappers
+
+    # Change the working directory to the new root
+    os.chdir(new_root)
+
+    if fast_root:
+        # Move the new root over / and enter it
+        linux.mount(new_root, '/', None, linux.MS_MOVE, None)
+        os.chroot('.')
+        os.chdir('/')
+        return
+
+    # Prepare for changing the root filesystem
+    old_root = os.path.join(new_root, 'old_root')
+    # Create a directory for the old root if it doesn't exist
+    os.makedirs(old_root, exist_ok=True)
+
+    # Perform the pivot_root operation
+    linux.pivot_root(new_root, old_root)
+
+    # Change the current working directory to the new root
+    os.chdir('/')
+
+    # Unmount and attempt to remove the old root directory
+    linux.umount2('/old_root', linux.MNT_DETACH)
+    try:
+        # Remove the old root directory if it's empty. It is only reachable as /old_root
+        # by now, as the old_root path above was relative to the host's root.
+        os.rmdir('/old_root')
+    except OSError as e:
+        if e.errno != errno.ENOTEMPTY:
+            raise
+
+
+def contain(command, image_name, image_dir, container_id, container_dir, cpu_shares, memory, memory_swap,
+            fast_root=False, slim_image=False, reflink_root=False):
     """
     Set up and execute the container environment.
 
@@ -303,65 +1360,66 @@ def contain(command, image_name, image_dir, container_id, container_dir, cpu_sha
     - cpu_shares (int): CPU shares for the container's cgroup.
     - memory (int): Memory limit in bytes.
     - memory_swap (int): Total limit for the combined used memory and swap.
+    - fast_root (bool): Enter the new root with MS_MOVE and chroot instead of pivot_root.
+    - slim_image (bool): Run from an image root without documentation and translations.
+    - reflink_root (bool): Run from a reflinked copy of the image root rather than an overlay.
 
     Raises:
-    - OSError: If an error occurs in setting up the container environment.
+    - OSError: If an error occurs in setting up the container environment. The
+      clone callback wrapper prints its traceback.
     """
-    try:
-        # Set up the CPU cgroup for resource allocation
-        _setup_cpu_cgroup(container_id, cpu_shares)
+    import linux  # Linux sys call wrappers
 
-        # Set the hostname of the container to its unique ID
-        linux.sethostname(container_id)
+    # Set up the CPU cgroup for resource allocation
+    _setup_cpu_cgroup(container_id, cpu_shares)
 
-        # Make all mounts in the current namespace private
-        linux.mount(None, '/', None, linux.MS_PRIVATE | linux.MS_REC, None)
+    # Set the hostname of the container to its unique ID
+    linux.sethostname(container_id)
 
-        # Create a new filesystem root for the container
-        new_root = create_container_root(image_name, image_dir, container_id, container_dir)
+    # Make all mounts in the current namespace private
+    linux.mount(None, '/', None, linux.MS_PRIVATE | linux.MS_REC, None)
 
-        # Set up necessary filesystem mounts within the new root
-        _create_mounts(new_root)
+    # Create a new filesystem root for the container
+    new_root = create_container_root(image_name, image_dir, container_id, container_dir, slim_image,
+                                     reflink_root)
 
-        # Change the working directory to the new root
-        os.chdir(new_root)
+    # Set up necessary filesystem mounts within the new root
+    _create_mounts(new_root)
 
-        # Prepare for changing the root filesystem
-        old_root = os.path.join(new_root, 'old_root')
-        if not os.path.exists(old_root):
-            # Create a directory for the old root if it doesn't exist
-            os.makedirs(old_root)
+    # Make the new root the container's root filesystem
+    _change_root(new_root, fast_root)
 
-        # Perform the pivot_root operation
-        linux.pivot_root(new_root, old_root)
+    # Execute the specified command within the container environment
+    _exec_command(command)
 
-        # Change the current working directory to the new root
-        os.chdir('/')
 
-        # Unmount and attempt to remove the old root directory
-        linux.umount2('/old_root', linux.MNT_DETACH)
-        if os.path.exists(old_root) and not os.listdir(old_root):
-            # Remove the old root directory if it's empty
-            os.rmdir(old_root)
+def _exec_command(command):
+    """
+    Replace the container process with its command.
 
-        # Execute the specified command within the container environment
-        os.execvp(command[0], command)
+    The command is looked up in the container's own root, once, rather than by
+    execvp trying every PATH entry, and starts with a minimal environment and
+    only the standard file descriptors open.
 
-    except OSError as e:
-        # Handle any exceptions that occur during container setup
-        print(f"Error in container setup: {e}")
-        raise
+    Args:
+    - command (list): Command to be executed, the program first.
+
+    Raises:
+    - OSError: If the command cannot be executed.
+    """
+    executable = shutil.which(command[0], path=CONTAINER_PATH) or command[0]
+
+    env = {'PATH': CONTAINER_PATH, 'HOME': '/root'}
+    if 'TERM' in os.environ:
+        env['TERM'] = os.environ['TERM']  # Keeps interactive programs working on the caller's terminal
 
+    # Descriptors held by this process, such as a daemon connection, must not leak into the container
+    os.closerange(3, os.sysconf('SC_OPEN_MAX'))
+    os.execve(executable, command, env)
 
-@cli.command(context_settings={'ignore_unknown_options': True})
-@click.option('--memory', help='Memory limit in bytes. Use suffixes (k, m, g) for larger units.', default=None)
-@click.option('--memory-swap', help='Total memory plus swap limit. Specify -1 for unlimited swap.', default=None)
-@click.option('--cpu-shares', help='CPU shares (relative weight)', default=0)
-@click.option('--image-name', '-i', help='Image name', default='ubuntu')
-@click.option('--image-dir', help='Images directory', default=IMAGE_DIR)
-@click.option('--container-dir', help='Containers directory', default=CONTAINER_DIR)
-@click.argument('command', required=True, nargs=-1)
-def run(memory, memory_swap, cpu_shares, image_name, image_dir, container_dir, command):
+
+def run(memory, memory_swap, cpu_shares, image_name, image_dir, container_dir, fast_root, slim_image, reflink_root,
+        socket_path, command):
     """
     Run a command in a new container.
 
@@ -372,26 +1430,267 @@ def run(memory, memory_swap, cpu_shares, image_name, image_dir, container_dir, c
     - image_name (str): Name of the container image.
     - image_dir (str): Directory where container images are stored.
     - container_dir (str): Directory for storing container data.
+    - fast_root (bool): Enter the container root with MS_MOVE and chroot instead of pivot_root.
+    - slim_image (bool): Run from an image root without documentation and translations.
+    - reflink_root (bool): Run from a reflinked copy of the image root rather than an overlay.
+    - socket_path (str): Unix socket of the `bb.py daemon` to start the container with.
     - command (tuple): Command to be executed in the container.
+
+    When a `bb.py daemon` is listening, the container is started by the daemon
+    so that interpreter start up and imports are already paid for. Commands run
+    from an interactive terminal always start in-process, as only a container
+    started from the terminal's own session can use it for job control.
+
+    Raises:
+    - FileNotFoundError: If the image or container directory does not exist.
+    """
+    image_dir = os.path.abspath(image_dir)
+    container_dir = os.path.abspath(container_dir)
+    # Fail here rather than inside the cloned container process, which can only report an exit status
+    _verify_dir(image_dir, 'Image directory')
+    _verify_dir(container_dir, 'Container base directory')
+
+    request = {
+        'command': list(command),
+        'image_name': image_name,
+        'image_dir': image_dir,
+        'container_dir': container_dir,
+        'cpu_shares': cpu_shares,
+        'memory': memory,
+        'memory_swap': memory_swap,
+        'fast_root': fast_root,
+        'slim_image': slim_image,
+        'reflink_root': reflink_root,
+    }
+
+    reply = None
+    if not sys.stdin.isatty():
+        try:
+            reply = _run_with_daemon(request, socket_path)
+        except OSError as e:
+            # The daemon's handler has already logged the details
+            logger.error("%s", e)
+            sys.exit(1)
+    if reply is None:
+        # No daemon is running, start the container from this process
+        pid, status = _run_container(**request)
+    else:
+        pid, status = reply['pid'], reply['status']
+
+    logger.info('Container process %d exited with status %d', pid, status)
+
+
+def _run_container(command, image_name, image_dir, container_dir, cpu_shares, memory, memory_swap, fast_root,
+                   slim_image=False, reflink_root=False):
+    """
+    Start a container process and wait for it to exit.
+
+    Args:
+    - command (list): Command to be executed in the container.
+    - image_name (str): Name of the container image.
+    - image_dir (str): Directory where container images are stored.
+    - container_dir (str): Directory for storing container data.
+    - cpu_shares (int): CPU shares for the container.
+    - memory (str): Memory limit in bytes.
+    - memory_swap (str): Total memory plus swap limit.
+    - fast_root (bool): Enter the container root with MS_MOVE and chroot instead of pivot_root.
+    - slim_image (bool): Run from an image root without documentation and translations.
+    - reflink_root (bool): Run from a reflinked copy of the image root rather than an overlay.
+
+    Returns:
+    - tuple: The container's PID and its exit status, or the negated signal
+      number if it was killed.
     """
-    container_id = str(uuid.uuid4())
+    import linux  # Linux sys call wrappers
+
+    # 12 hex characters (48 random bits) are plenty to tell local containers apart
+    container_id = secrets.token_hex(6)
 
-    # Flags for namespaces to be created for the new container process
-    flags = linux.CLONE_NEWPID | linux.CLONE_NEWNS | linux.CLONE_NEWUTS | linux.CLONE_NEWNET
+    # Flags for namespaces to be created for the new container process.
+    # CLONE_VFORK keeps this process asleep until the container has set itself up and
+    # exec'd its command. CLONE_VM cannot be added, as the child runs Python code and
+    # would corrupt this interpreter's memory.
+    flags = linux.CLONE_NEWPID | linux.CLONE_NEWNS | linux.CLONE_NEWUTS | linux.CLONE_NEWNET | linux.CLONE_VFORK
 
     # Arguments for the container setup callback function
-    callback_args = (command, image_name, image_dir, container_id, container_dir, cpu_shares, memory, memory_swap)
+    callback_args = (command, image_name, image_dir, container_id, container_dir, cpu_shares, memory, memory_swap,
+                     fast_root, slim_image, reflink_root)
 
     # Create a new process for the container
-    pid = linux.clone(contain, flags, callback_args)
+    pid = linux.clone(contain, flags, callback_args, CLONE_STACK_SIZE)
+
+    # A pidfd keeps referring to this process even once its PID is reused
+    pidfd = _open_pidfd(pid)
+    try:
+        # Record the host PID for `bb.py stop`, with the pidfd inode telling this process
+        # apart from a later one reusing its PID. CLONE_VFORK only returns once the
+        # container has exec'd, so its directory exists by now.
+        pid_record = b'%d' % pid if pidfd is None else b'%d %d' % (pid, os.fstat(pidfd).st_ino)
+        try:
+            _write_small(_get_container_path(container_id, container_dir, 'pid.txt'), pid_record)
+        except OSError:
+            pass  # The container failed before creating its directory, waiting reports it
+
+        # Wait for the container process to complete and fetch its exit status
+        if pidfd is None:
+            _, status = os.waitpid(pid, 0)
+            return pid, os.waitstatus_to_exitcode(status)
+        result = os.waitid(os.P_PIDFD, pidfd, os.WEXITED)
+    finally:
+        if pidfd is not None:
+            os.close(pidfd)
+
+    if result.si_code == os.CLD_EXITED:
+        return pid, result.si_status
+    return pid, -result.si_status  # Killed by a signal
+
+
+def _open_pidfd(pid):
+    """
+    Open a process file descriptor for a PID.
+
+    Args:
+    - pid (int): The process to refer to.
+
+    Returns:
+    - int: The pidfd, or None when the kernel predates pidfds (Linux 5.3).
+
+    Raises:
+    - ProcessLookupError: If the process does not exist.
+    """
+    try:
+        return os.pidfd_open(pid)
+    except OSError as e:
+        if e.errno == errno.ENOSYS:
+            return None
+        raise
+
+
+def _run_with_daemon(request, socket_path=DAEMON_SOCKET):
+    """
+    Ask a running BantuBox daemon to start a container.
+
+    The request is sent with this process's stdin, stdout and stderr attached,
+    so the container reads and writes the caller's streams.
+
+    Args:
+    - request (dict): Keyword arguments for _run_container.
+    - socket_path (str): Path of the daemon's Unix socket.
+
+    Returns:
+    - dict: The daemon's reply with the container's `pid` and `status`, or
+      None if no daemon is listening.
+
+    Raises:
+    - OSError: If the daemon failed to start the container, or gave no usable reply.
+    """
+    message = json.dumps(request).encode()
+    if len(message) > DAEMON_MESSAGE_SIZE:
+        raise OSError(f"The run request is over the daemon's {DAEMON_MESSAGE_SIZE} byte limit")
+
+    # SOCK_SEQPACKET keeps message boundaries, so the request arrives whole in one recv
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+    try:
+        client.connect(socket_path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        client.close()
+        return None
+
+    with client:
+        socket.send_fds(client, [message], [0, 1, 2])
+        # The daemon replies once the container has exited, then closes the connection
+        try:
+            message = client.recv(DAEMON_MESSAGE_SIZE)
+        except ConnectionResetError:
+            message = b''  # The handler went away without reading the request
+
+    try:
+        reply = json.loads(message)
+    except ValueError:
+        # The handler died before replying, e.g. it was killed
+        raise OSError(f"The daemon at {socket_path} closed the connection without a reply") from None
+    if 'error' in reply:
+        raise OSError(f"The daemon failed to start the container: {reply['error']}")
+    return reply
+
+
+def daemon(socket_path):
+    """
+    Start containers on behalf of `bb.py run`.
+
+    Every connection is handled by a forked child of this process, which
+    already has the interpreter and all modules loaded, and finds the /dev
+    template already built.
+
+    Args:
+    - socket_path (str): Unix socket to listen on.
+    """
+    # Load everything a container start needs now, so that every forked handler
+    # inherits it: the lazily imported modules and the /dev template.
+    import linux  # Linux sys call wrappers
+    import tarfile  # Extracting the image tarball files
+    _ensure_dev_template()
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)  # Left behind by a previous daemon
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET) as server:
+        server.bind(socket_path)
+        os.chmod(socket_path, 0o600)  # Starting containers requires root
+        server.listen()
+
+        # Let the kernel reap the request handlers
+        signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+
+        while True:
+            conn, _ = server.accept()
+            if os.fork() == 0:
+                server.close()
+                try:
+                    _serve_run_request(conn)
+                finally:
+                    os._exit(0)
+            conn.close()
+
+
+def _serve_run_request(conn):
+    """
+    Start the container described by a client request and report its exit.
 
-    # Wait for the container process to complete and fetch its exit status
-    _, status = os.waitpid(pid, 0)
-    print(f'Container process {pid} exited with status {status}')
+    Args:
+    - conn (socket.socket): Connection to the `bb.py run` client.
+    """
+    # The handler waits for its container, so it must not inherit the daemon's SIGCHLD setting
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+
+    with conn:
+        message, fds, flags, _ = socket.recv_fds(conn, DAEMON_MESSAGE_SIZE, 3)
+        try:
+            if flags & (socket.MSG_TRUNC | socket.MSG_CTRUNC) or len(fds) != 3:
+                raise ValueError(f"not a request of at most {DAEMON_MESSAGE_SIZE} bytes with 3 descriptors")
+            request = json.loads(message)
+        except ValueError as e:
+            logger.error("Rejected run request: %s", e)
+            for fd in fds:
+                os.close(fd)
+            conn.sendall(json.dumps({'error': f"invalid run request: {e}"}).encode())
+            return
+
+        # Take over the client's stdin, stdout and stderr for the container
+        for target_fd, fd in enumerate(fds):
+            os.dup2(fd, target_fd)
+            os.close(fd)
+
+        try:
+            pid, status = _run_container(**request)
+            reply = {'pid': pid, 'status': status}
+        except Exception as e:
+            # The handler exits right after, so report the failure instead of losing it
+            logger.exception("Failed to start container for %s", request.get('image_name'))
+            reply = {'error': str(e) or type(e).__name__}
+        conn.sendall(json.dumps(reply).encode())
 
 
-@cli.command(context_settings=dict(ignore_unknown_options=True))
-@click.argument('container_id', required=True, nargs=-1)
 def stop(container_id):
     """
     Stop a running container.
@@ -399,13 +1698,31 @@ def stop(container_id):
     Args:
     - container_id (str): Unique identifier of the container to be stopped.
     """
-    container_dir = '/home/aropet/bantubox/containers'
-    
-    for cid in container_id:
-        try:
-            _stop_single_container(cid, container_dir)
-        except Exception as e:
-            print(f"Error stopping container {cid}: {e}")
+    _for_each_container(_stop_single_container, container_id, 'stopping')
+
+
+def _for_each_container(operation, container_ids, action):
+    """
+    Apply an operation to several containers at once.
+
+    Stopping and deleting mostly wait on signals and on rm unlinking trees,
+    so the containers are handled by a thread pool rather than one by one.
+    A failure is logged and does not affect the other containers.
+
+    Args:
+    - operation (Callable): Called with a container ID and the container directory.
+    - container_ids (list): IDs of the containers to operate on.
+    - action (str): What the operation does, for error messages (e.g. 'stopping').
+    """
+    workers = min(CONTAINER_OP_WORKERS, len(container_ids)) or 1
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [(cid, pool.submit(operation, cid, CONTAINER_DIR)) for cid in container_ids]
+        # Report in the order the containers were given
+        for cid, future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                logger.error("Error %s container %s: %s", action, cid, e)
 
 
 def _stop_single_container(cid, container_dir):
@@ -427,36 +1744,71 @@ def _stop_single_container(cid, container_dir):
         raise FileNotFoundError(f"PID file for container {cid} not found.")
 
     with open(pid_file_path, 'r') as pid_file:
-        container_pid = int(pid_file.read())
+        fields = pid_file.read().split()
+    container_pid = int(fields[0])
+
+    # Signal through a pidfd, checked against the container's own, so that a
+    # process which has since been given the container's PID is never killed
+    pidfd = _open_pidfd(container_pid)
+    if pidfd is None:
+        os.kill(container_pid, signal.SIGTERM)
+    else:
+        try:
+            if len(fields) > 1 and os.fstat(pidfd).st_ino != int(fields[1]):
+                raise ProcessLookupError(f"Container {cid} process {container_pid} has already exited.")
+            signal.pidfd_send_signal(pidfd, signal.SIGTERM)
+        finally:
+            os.close(pidfd)
+    # The container's root is only mounted in its private mount namespace, which
+    # goes away with the container, so there is nothing to unmount from here
+    _remove_tree(os.path.join(container_dir, cid))
+    logger.info("Container %s stopped and resources cleaned up.", cid)
+
+
+def _remove_tree(path):
+    """
+    Remove a container directory tree.
+
+    The removal is handed to rm, which unlinks every entry from a C loop
+    relative to directory descriptors instead of making a Python-level call
+    per inode. shutil.rmtree is used when rm is not installed.
 
-    os.kill(container_pid, signal.SIGTERM)
-    shutil.rmtree(os.path.join(container_dir, cid))
-    print(f"Container {cid} stopped and resources cleaned up.")
+    Args:
+    - path (str): Directory to remove.
+
+    Raises:
+    - OSError: If the tree cannot be removed.
+    """
+    rm_binary = shutil.which('rm')
+    if rm_binary is None:
+        shutil.rmtree(path)
+        return
+
+    try:
+        subprocess.run([rm_binary, '-rf', '--', path], check=True)
+    except subprocess.CalledProcessError as e:
+        raise OSError(f"Failed to remove {path}: {e}")
 
 
-@cli.command(name='list')
 def list_containers():
     """
     List all available containers.
     """
-    container_dir = '/home/aropet/bantubox/containers'
-    
     try:
-        containers = [container for container in os.listdir(container_dir) if os.path.isdir(os.path.join(container_dir, container))]
+        # DirEntry.is_dir uses the file type reported by readdir, avoiding a stat per entry
+        with os.scandir(CONTAINER_DIR) as entries:
+            containers = [entry.name for entry in entries if entry.is_dir(follow_symlinks=False)]
     except Exception as e:
-        print(f"Error listing containers: {e}")
+        logger.error("Error listing containers: %s", e)
         return
 
     if not containers:
         print("No containers available.")
     else:
-        print("Available containers:")
-        for container in containers:
-            print(f"- {container}")
+        # Sorted for stable output, and written in one call rather than a print per container
+        sys.stdout.write("Available containers:\n" + "".join(f"- {container}\n" for container in sorted(containers)))
 
 
-@cli.command(context_settings=dict(ignore_unknown_options=True))
-@click.argument('container_id', required=True, nargs=-1)
 def delete(container_id):
     """
     Delete a specified container.
@@ -464,14 +1816,7 @@ def delete(container_id):
     Args:
     - container_id (str): Unique identifier of the container to be deleted.
     """
-    container_dir = '/home/aropet/bantubox/containers'
-
-    for cid in container_id:
-        try:
-            _delete_single_container(cid, container_dir)
-            print(f"Container {cid} deleted.")
-        except Exception as e:
-            print(f"Error deleting container {cid}: {e}")
+    _for_each_container(_delete_single_container, container_id, 'deleting')
 
 
 def _delete_single_container(cid, container_dir):
@@ -491,8 +1836,76 @@ def _delete_single_container(cid, container_dir):
     if not os.path.exists(container_path):
         raise FileNotFoundError(f"Container {cid} not found.")
 
-    shutil.rmtree(container_path)
+    _remove_tree(container_path)
+    logger.info("Container %s deleted.", cid)
+
+
+def cli(argv=None):
+    """
+    Command-line interface for managing containers with BantuBox.
+
+    This CLI provides commands for running, stopping, listing, and deleting containers.
+
+    Each command is an argparse subparser dispatching to the function of the same
+    name, akin to creating a command with multiple actions, like `git push`,
+    `git pull`, etc., where `git` would be the program and `push`, `pull` are its
+    subcommands.
+
+    Args:
+    - argv (list): Command line arguments, defaults to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(prog='bb.py', description='Manage containers with BantuBox.')
+    subcommands = parser.add_subparsers(dest='subcommand', required=True)
+
+    run_parser = subcommands.add_parser('run', help='Run a command in a new container.')
+    run_parser.add_argument('--memory', help='Memory limit in bytes. Use suffixes (k, m, g) for larger units.',
+                            default=None)
+    run_parser.add_argument('--memory-swap', help='Total memory plus swap limit. Specify -1 for unlimited swap.',
+                            default=None)
+    run_parser.add_argument('--cpu-shares', help='CPU shares (relative weight)', type=int, default=0)
+    run_parser.add_argument('--image-name', '-i', help='Image name', default='ubuntu')
+    run_parser.add_argument('--image-dir', help='Images directory', default=IMAGE_DIR)
+    run_parser.add_argument('--container-dir', help='Containers directory', default=CONTAINER_DIR)
+    run_parser.add_argument('--fast-root', action='store_true',
+                            help='Enter the container root with chroot instead of pivot_root')
+    run_parser.add_argument('--slim-image', action='store_true',
+                            help='Leave documentation, man pages and translations out of the image root')
+    run_parser.add_argument('--reflink-root', action='store_true',
+                            help='Use a reflinked copy of the image as the container root instead of an overlay')
+    run_parser.add_argument('--socket-path', help='Unix socket of the daemon to start the container with',
+                            default=DAEMON_SOCKET)
+    # Everything from the command on belongs to the container, including its options
+    run_parser.add_argument('command', nargs=argparse.REMAINDER)
+    run_parser.set_defaults(func=run)
+
+    daemon_parser = subcommands.add_parser('daemon', help='Start containers on behalf of `bb.py run`.')
+    daemon_parser.add_argument('--socket-path', help='Unix socket to listen on', default=DAEMON_SOCKET)
+    daemon_parser.set_defaults(func=daemon)
+
+    stop_parser = subcommands.add_parser('stop', help='Stop a running container.')
+    stop_parser.add_argument('container_id', nargs='+')
+    stop_parser.set_defaults(func=stop)
+
+    list_parser = subcommands.add_parser('list', help='List all available containers.')
+    list_parser.set_defaults(func=list_containers)
+
+    delete_parser = subcommands.add_parser('delete', help='Delete a specified container.')
+    delete_parser.add_argument('container_id', nargs='+')
+    delete_parser.set_defaults(func=delete)
+
+    args = vars(parser.parse_args(argv))
+    if args['subcommand'] == 'run':
+        # REMAINDER keeps the '--' separating the command from run's options, click dropped it
+        if args['command'][:1] == ['--']:
+            del args['command'][0]
+        if not args['command']:
+            run_parser.error('the following arguments are required: command')
+
+    func = args.pop('func')
+    del args['subcommand']
+    func(**args)
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=os.environ.get('BB_LOG', 'WARNING').upper(), format='%(name)s: %(message)s')
     cli()
@@ -5,9 +5,33 @@
 #include <sched.h>
 #include <sys/wait.h>
 #include <unistd.h>
+#include <fcntl.h>
 
 #define STACK_SIZE 32768
 
+/* New mount API (Linux 5.2), not wrapped by older C libraries */
+#ifndef SYS_fsopen
+#define SYS_open_tree 428
+#define SYS_move_mount 429
+#define SYS_fsopen 430
+#define SYS_fsconfig 431
+#define SYS_fsmount 432
+#endif
+
+#ifndef FSOPEN_CLOEXEC
+#define FSOPEN_CLOEXEC 0x00000001
+#define FSMOUNT_CLOEXEC 0x00000001
+#define FSCONFIG_SET_FLAG 0
+#define FSCONFIG_SET_STRING 1
+#define FSCONFIG_SET_FD 5
+#define FSCONFIG_CMD_CREATE 6
+#define MOVE_MOUNT_F_EMPTY_PATH 0x00000004
+#define MOUNT_ATTR_RDONLY 0x00000001
+#define MOUNT_ATTR_NOSUID 0x00000002
+#define MOUNT_ATTR_NODEV 0x00000004
+#define MOUNT_ATTR_NOEXEC 0x00000008
+#endif
+
 #define LINUX_MODULE_DOC "linux\n"\
                          "=====\n"\
                          "The linux module is a simple Python c extension, containing syscall wrappers "\
@@ -199,6 +223,123 @@ _setns(PyObject *self, PyObject *args) {
 	}
 }
 
+#define FSOPEN_DOC  ".. py:function:: fsopen(fsname, flags)\n"\
+                    "\n"\
+                    "open a filesystem context for creating a new mount\n"\
+                    "\n"\
+                    ":param str fsname: filesystem type supported by the kernel, e.g. ``proc``\n"\
+                    ":param int flags: ``0`` or ``linux.FSOPEN_CLOEXEC``\n"\
+                    ":return: file descriptor of the filesystem context\n"\
+                    ":raises RuntimeError: if fsopen fails\n"\
+                    "\n"
+
+static PyObject *
+_fsopen(PyObject *self, PyObject *args) {
+	const char *fsname;
+	unsigned int flags;
+	int fd;
+
+	if (!PyArg_ParseTuple(args, "sI", &fsname, &flags))
+		return NULL;
+
+	if ((fd = syscall(SYS_fsopen, fsname, flags)) == -1) {
+		PyErr_SetFromErrno(PyExc_RuntimeError);
+		return NULL;
+	}
+
+	return Py_BuildValue("i", fd);
+}
+
+#define FSCONFIG_DOC    ".. py:function:: fsconfig(fs_fd, cmd, key, value, aux)\n"\
+                        "\n"\
+                        "configure a filesystem context\n"\
+                        "\n"\
+                        ":param int fs_fd: file descriptor returned by ``fsopen``\n"\
+                        ":param int cmd: one of ``linux.FSCONFIG_SET_FLAG``, ``linux.FSCONFIG_SET_STRING``,\n"\
+                        "                ``linux.FSCONFIG_SET_FD`` or ``linux.FSCONFIG_CMD_CREATE``\n"\
+                        ":param str key: parameter name (can be ``None``)\n"\
+                        ":param str value: parameter value (can be ``None``)\n"\
+                        ":param int aux: file descriptor for ``linux.FSCONFIG_SET_FD``, otherwise ``0``\n"\
+                        ":return: None\n"\
+                        ":raises RuntimeError: if fsconfig fails\n"\
+                        "\n"
+
+static PyObject *
+_fsconfig(PyObject *self, PyObject *args) {
+	const char *key, *value;
+	int fs_fd, aux;
+	unsigned int cmd;
+
+	if (!PyArg_ParseTuple(args, "iIzzi", &fs_fd, &cmd, &key, &value, &aux))
+		return NULL;
+
+	if (syscall(SYS_fsconfig, fs_fd, cmd, key, value, aux) == -1) {
+		PyErr_SetFromErrno(PyExc_RuntimeError);
+		return NULL;
+	} else {
+		Py_INCREF(Py_None);
+		return Py_None;
+	}
+}
+
+#define FSMOUNT_DOC ".. py:function:: fsmount(fs_fd, flags, attr_flags)\n"\
+                    "\n"\
+                    "create a detached mount from a configured filesystem context\n"\
+                    "\n"\
+                    ":param int fs_fd: file descriptor returned by ``fsopen``\n"\
+                    ":param int flags: ``0`` or ``linux.FSMOUNT_CLOEXEC``\n"\
+                    ":param int attr_flags: any combination (using ``|``) of ``linux.MOUNT_ATTR_*`` flags\n"\
+                    ":return: file descriptor of the detached mount\n"\
+                    ":raises RuntimeError: if fsmount fails\n"\
+                    "\n"
+
+static PyObject *
+_fsmount(PyObject *self, PyObject *args) {
+	int fs_fd, fd;
+	unsigned int flags, attr_flags;
+
+	if (!PyArg_ParseTuple(args, "iII", &fs_fd, &flags, &attr_flags))
+		return NULL;
+
+	if ((fd = syscall(SYS_fsmount, fs_fd, flags, attr_flags)) == -1) {
+		PyErr_SetFromErrno(PyExc_RuntimeError);
+		return NULL;
+	}
+
+	return Py_BuildValue("i", fd);
+}
+
+#define MOVE_MOUNT_DOC  ".. py:function:: move_mount(from_dfd, from_path, to_dfd, to_path, flags)\n"\
+                        "\n"\
+                        "move a mount, or attach a detached one, to a new location\n"\
+                        "\n"\
+                        ":param int from_dfd: file descriptor of the mount (or its directory)\n"\
+                        ":param str from_path: path relative to `from_dfd`, ``\"\"`` with ``linux.MOVE_MOUNT_F_EMPTY_PATH``\n"\
+                        ":param int to_dfd: directory file descriptor `to_path` is relative to, or ``linux.AT_FDCWD``\n"\
+                        ":param str to_path: mount point to attach to\n"\
+                        ":param int flags: any combination (using ``|``) of ``linux.MOVE_MOUNT_*`` flags\n"\
+                        ":return: None\n"\
+                        ":raises RuntimeError: if move_mount fails\n"\
+                        "\n"
+
+static PyObject *
+_move_mount(PyObject *self, PyObject *args) {
+	const char *from_path, *to_path;
+	int from_dfd, to_dfd;
+	unsigned int flags;
+
+	if (!PyArg_ParseTuple(args, "isisI", &from_dfd, &from_path, &to_dfd, &to_path, &flags))
+		return NULL;
+
+	if (syscall(SYS_move_mount, from_dfd, from_path, to_dfd, to_path, flags) == -1) {
+		PyErr_SetFromErrno(PyExc_RuntimeError);
+		return NULL;
+	} else {
+		Py_INCREF(Py_None);
+		return Py_None;
+	}
+}
+
 struct py_clone_args {
 	PyObject *callback;
 	PyObject *callback_args;
@@ -217,7 +358,7 @@ static int clone_callback(void *args) {
 	return 0;
 }
 
-#define CLONE_DOC   ".. py:function:: clone(callback, flags, callback_args)\n"\
+#define CLONE_DOC   ".. py:function:: clone(callback, flags, callback_args[, stack_size])\n"\
                     "\n"\
                     "create a child process\n"\
                     "\n"\
@@ -225,6 +366,7 @@ static int clone_callback(void *args) {
                     ":param int flags: combination (using ``|``) of flags specifying what should be shared\n"\
                     "                  between the calling process and the child process. See below.\n"\
                     ":param tuple callback_args: tuple of arguments for the callback function\n"\
+                    ":param int stack_size: size in bytes of the stack the callback runs on (default 32768)\n"\
                     ":return: On success, the thread ID of the child process\n"\
                     ":raises RuntimeError: if clone fails\n"\
                     "\n"\
@@ -235,18 +377,23 @@ static int clone_callback(void *args) {
                     "* ``linux.CLONE_NEWUTS`` - Unshare the UTS namespace (hostname, domainname, etc)\n"\
                     "* ``linux.CLONE_NEWNET`` - Unshare the network namespace\n"\
                     "* ``linux.CLONE_NEWPID`` - Unshare the PID namespace\n"\
+                    "* ``linux.CLONE_VFORK`` - Suspend the caller until the child calls execve or exits\n"\
 
 static PyObject *
 _clone(PyObject *self, PyObject *args) {
 	PyObject *callback, *callback_args;
 	void *child_stack;
 	int flags;
+	Py_ssize_t stack_size = STACK_SIZE;
 	pid_t child_pid;
 
-	child_stack = malloc(STACK_SIZE);
+	if (!PyArg_ParseTuple(args, "OiO|n", &callback, &flags, &callback_args, &stack_size))
+		return NULL;
 
-	if (!PyArg_ParseTuple(args, "OiO", &callback, &flags, &callback_args))
+	if (stack_size <= 0) {
+		PyErr_SetString(PyExc_ValueError, "stack_size must be positive");
 		return NULL;
+	}
 
 	if (!PyCallable_Check(callback)) {
 		PyErr_SetString(PyExc_TypeError, "parameter must be callable");
@@ -257,9 +404,12 @@ _clone(PyObject *self, PyObject *args) {
     call_args.callback = callback;
     call_args.callback_args = callback_args;
 
-	if ((child_pid = clone(&clone_callback, child_stack + STACK_SIZE, flags | SIGCHLD, &call_args)) == -1) {
+	if ((child_stack = malloc(stack_size)) == NULL)
+		return PyErr_NoMemory();
+
+	if ((child_pid = clone(&clone_callback, child_stack + stack_size, flags | SIGCHLD, &call_args)) == -1) {
 			PyErr_SetFromErrno(PyExc_RuntimeError);
-			return Py_BuildValue("i", -1);
+			return NULL;
 	} else {
 		return Py_BuildValue("i", child_pid);
 	}
@@ -299,6 +449,10 @@ static struct PyMethodDef LinuxMethods[] = {
     {"mount", _mount, METH_VARARGS, MOUNT_DOC},
     {"umount", _umount, METH_VARARGS, UMOUNT_DOC},
     {"umount2", _umount2, METH_VARARGS, UMOUNT2_DOC},
+    {"fsopen", _fsopen, METH_VARARGS, FSOPEN_DOC},
+    {"fsconfig", _fsconfig, METH_VARARGS, FSCONFIG_DOC},
+    {"fsmount", _fsmount, METH_VARARGS, FSMOUNT_DOC},
+    {"move_mount", _move_mount, METH_VARARGS, MOVE_MOUNT_DOC},
     {NULL, NULL, 0, NULL}        /* Sentinel */
 };
 
@@ -327,6 +481,7 @@ PyInit_linux(void)
 	PyModule_AddIntConstant(module, "CLONE_NEWIPC", CLONE_NEWIPC);   // IPC namespace
 	PyModule_AddIntConstant(module, "CLONE_NEWNET", CLONE_NEWNET);   // network namespace
 	PyModule_AddIntConstant(module, "CLONE_THREAD", CLONE_THREAD);
+	PyModule_AddIntConstant(module, "CLONE_VFORK", CLONE_VFORK);     // suspend the caller until the child execs
 
 	// mount constants
 	PyModule_AddIntConstant(module, "MS_RDONLY", MS_RDONLY);               /* Mount read-only.  */
@@ -357,6 +512,20 @@ PyInit_linux(void)
 	PyModule_AddIntConstant(module, "MNT_DETACH", MNT_DETACH);             /* Just detach from the tree.  */
 	PyModule_AddIntConstant(module, "MS_MGC_VAL", MS_MGC_VAL);
 
+	// new mount API constants
+	PyModule_AddIntConstant(module, "AT_FDCWD", AT_FDCWD);
+	PyModule_AddIntConstant(module, "FSOPEN_CLOEXEC", FSOPEN_CLOEXEC);
+	PyModule_AddIntConstant(module, "FSMOUNT_CLOEXEC", FSMOUNT_CLOEXEC);
+	PyModule_AddIntConstant(module, "FSCONFIG_SET_FLAG", FSCONFIG_SET_FLAG);         /* Set parameter, supplying no value */
+	PyModule_AddIntConstant(module, "FSCONFIG_SET_STRING", FSCONFIG_SET_STRING);     /* Set parameter, supplying a string value */
+	PyModule_AddIntConstant(module, "FSCONFIG_SET_FD", FSCONFIG_SET_FD);             /* Set parameter, supplying an object by fd */
+	PyModule_AddIntConstant(module, "FSCONFIG_CMD_CREATE", FSCONFIG_CMD_CREATE);     /* Create new or reuse existing superblock */
+	PyModule_AddIntConstant(module, "MOVE_MOUNT_F_EMPTY_PATH", MOVE_MOUNT_F_EMPTY_PATH);
+	PyModule_AddIntConstant(module, "MOUNT_ATTR_RDONLY", MOUNT_ATTR_RDONLY);         /* Mount read-only */
+	PyModule_AddIntConstant(module, "MOUNT_ATTR_NOSUID", MOUNT_ATTR_NOSUID);         /* Ignore suid and sgid bits */
+	PyModule_AddIntConstant(module, "MOUNT_ATTR_NODEV", MOUNT_ATTR_NODEV);           /* Disallow access to device special files */
+	PyModule_AddIntConstant(module, "MOUNT_ATTR_NOEXEC", MOUNT_ATTR_NOEXEC);         /* Disallow program execution */
+
     return module;
 }
 #endif